@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Self-instrumentation for the technical review scripts.
+
+Runs review_analysis.py, review_analysis_part2.py and review_analysis_part3.py
+with profiling hooks around file loading, parsing and every review rule
+(one rule per "# ===" banner section), recording wall time, allocated bytes
+and findings count. Results are exported as:
+
+  - Prometheus exposition format (textfile for node_exporter's textfile
+    collector, and/or an HTTP /metrics endpoint)
+  - OTLP/HTTP JSON spans, sent to the OpenTelemetry Collector receiver
+    defined in configs-tempo-grafana-otel.yml
+
+Usage:
+  python3 review_telemetry.py --textfile /var/lib/node_exporter/textfile/review.prom
+  python3 review_telemetry.py --otlp                      # collector from config
+  python3 review_telemetry.py --otlp-endpoint http://127.0.0.1:14318
+  python3 review_telemetry.py --listen 9464               # serve /metrics
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import re
+import secrets
+import sys
+import time
+import tracemalloc
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+REVIEW_SCRIPTS = [
+    'review_analysis.py',
+    'review_analysis_part2.py',
+    'review_analysis_part3.py',
+]
+
+OTEL_CONFIG = 'configs-tempo-grafana-otel.yml'
+
+SERVICE_NAME = 'review-analysis'
+
+# Banner used by the review scripts to delimit each review section
+BANNER_RE = re.compile(r'^# =+\n# (?P<title>[^\n]+)\n# =+\n', re.MULTILINE)
+
+
+# =============================================================================
+# COLLECTOR ENDPOINT DISCOVERY
+# =============================================================================
+
+def collector_otlp_http_endpoint(config_path):
+    """
+    Return the OTLP/HTTP traces URL of the OpenTelemetry Collector (agent mode)
+    defined in configs-tempo-grafana-otel.yml.
+
+    The file concatenates several configs (YAML, INI, shell), so it is not
+    loaded as YAML; the collector section is located by its banner instead.
+    The receiver binds 0.0.0.0, which clients on the host reach via localhost.
+    """
+    with open(config_path, encoding='utf-8') as f:
+        text = f.read()
+
+    start = text.find('OPENTELEMETRY COLLECTOR CONFIGURATION')
+    if start == -1:
+        raise ValueError(f'No OpenTelemetry Collector section in {config_path}')
+    section = text[start:]
+    match = re.search(r'^\s+http:\s*\n\s+endpoint:\s*(\S+):(\d+)', section, re.MULTILINE)
+    if not match:
+        raise ValueError(f'No OTLP http receiver endpoint in {config_path}')
+
+    host, port = match.group(1), match.group(2)
+    if host in ('0.0.0.0', '::', ''):
+        host = 'localhost'
+    return f'http://{host}:{port}/v1/traces'
+
+
+# =============================================================================
+# PROFILED REVIEW RUN
+# =============================================================================
+
+def _rule_name(title):
+    return re.sub(r'[^a-z0-9]+', '_', title.lower()).strip('_')
+
+
+def _split_sections(source):
+    """Split a review script into (rule, first_line, text) sections."""
+    sections = []
+    matches = list(BANNER_RE.finditer(source))
+
+    preamble = source[:matches[0].start()] if matches else source
+    if any(line.strip() and not line.lstrip().startswith('#') for line in preamble.splitlines()):
+        sections.append(('preamble', 1, preamble))
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+        first_line = source.count('\n', 0, match.start()) + 1
+        sections.append((_rule_name(match.group('title')), first_line, source[match.start():end]))
+
+    return sections
+
+
+def _count_findings(namespace):
+    return sum(
+        len(value) for key, value in namespace.items()
+        if key.endswith('_issues') and isinstance(value, list)
+    )
+
+
+@contextlib.contextmanager
+def _profiled(samples, phase, script, rule=''):
+    """
+    Record wall time, or allocated bytes when tracemalloc is tracing, for the
+    enclosed block.
+    """
+    sample = {
+        'phase': phase,
+        'script': script,
+        'rule': rule,
+        'findings': 0,
+        'allocated_bytes': 0,
+    }
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+    sample['start_ns'] = time.time_ns()
+    t0 = time.perf_counter_ns()
+    try:
+        yield sample
+    finally:
+        sample['duration_ns'] = time.perf_counter_ns() - t0
+        sample['end_ns'] = sample['start_ns'] + sample['duration_ns']
+        if tracing:
+            _, peak = tracemalloc.get_traced_memory()
+            sample['allocated_bytes'] = max(peak - base, 0)
+        samples.append(sample)
+
+
+def _run_pass(scripts, base_dir):
+    samples = []
+    namespace = {'__name__': '__review__'}
+    output = io.StringIO()
+
+    for script in scripts:
+        path = os.path.join(base_dir, script)
+
+        with _profiled(samples, 'load', script):
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+
+        compiled = []
+        for rule, first_line, text in _split_sections(source):
+            with _profiled(samples, 'parse', script, rule):
+                tree = ast.parse(text, filename=path)
+                ast.increment_lineno(tree, first_line - 1)
+                compiled.append((rule, compile(tree, path, 'exec')))
+
+        for rule, code in compiled:
+            before = _count_findings(namespace)
+            with _profiled(samples, 'rule', script, rule) as sample:
+                with contextlib.redirect_stdout(output):
+                    exec(code, namespace)
+            sample['findings'] = _count_findings(namespace) - before
+
+    return samples, output.getvalue()
+
+
+def run_review(scripts=REVIEW_SCRIPTS, base_dir=HERE, track_allocations=True):
+    """
+    Execute the review scripts section by section, in a shared namespace.
+
+    Wall time is measured in a pass without tracemalloc, whose overhead would
+    otherwise dominate the timings. With track_allocations, the review is run
+    a second time under tracemalloc and only its allocated bytes are kept.
+
+    Returns (samples, output): one sample dict per load/parse/rule phase, and
+    the review report the scripts printed.
+    """
+    samples, output = _run_pass(scripts, base_dir)
+
+    if track_allocations:
+        tracemalloc.start()
+        try:
+            traced, _ = _run_pass(scripts, base_dir)
+        finally:
+            tracemalloc.stop()
+        for sample, traced_sample in zip(samples, traced):
+            sample['allocated_bytes'] = traced_sample['allocated_bytes']
+
+    return samples, output
+
+
+# =============================================================================
+# PROMETHEUS EXPOSITION
+# =============================================================================
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_exposition(samples, run_timestamp):
+    """Render samples in the Prometheus text exposition format."""
+    metrics = [
+        ('review_phase_duration_seconds', 'gauge',
+         'Wall time spent in a review phase (load, parse, rule), measured without tracemalloc.',
+         lambda s: s['duration_ns'] / 1e9),
+        ('review_phase_allocated_bytes', 'gauge',
+         'Peak bytes allocated by Python during a review phase, from a separate tracemalloc pass.',
+         lambda s: s['allocated_bytes']),
+    ]
+
+    lines = []
+    for name, metric_type, help_text, value in metrics:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for s in samples:
+            labels = (f'script="{_escape_label(s["script"])}",'
+                      f'phase="{s["phase"]}",rule="{_escape_label(s["rule"])}"')
+            lines.append(f'{name}{{{labels}}} {value(s)}')
+
+    lines.append('# HELP review_rule_findings Number of findings reported by a review rule.')
+    lines.append('# TYPE review_rule_findings gauge')
+    for s in samples:
+        if s['phase'] == 'rule':
+            labels = f'script="{_escape_label(s["script"])}",rule="{_escape_label(s["rule"])}"'
+            lines.append(f'review_rule_findings{{{labels}}} {s["findings"]}')
+
+    lines.append('# HELP review_last_run_timestamp_seconds Unix time of the last review run.')
+    lines.append('# TYPE review_last_run_timestamp_seconds gauge')
+    lines.append(f'review_last_run_timestamp_seconds {run_timestamp:.3f}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path, exposition):
+    """Write atomically so the textfile collector never reads a partial file."""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(exposition)
+    os.replace(tmp_path, path)
+
+
+def serve_metrics(port, exposition):
+    """Serve the exposition on http://0.0.0.0:<port>/metrics until interrupted."""
+    body = exposition.encode('utf-8')
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(('0.0.0.0', port), MetricsHandler)
+    print(f'Serving review metrics on http://0.0.0.0:{port}/metrics', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# =============================================================================
+# OTLP SPANS
+# =============================================================================
+
+def _attr(key, value):
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+def otlp_trace_payload(samples):
+    """
+    Build an OTLP/HTTP JSON ExportTraceServiceRequest: one root "review" span
+    with a child span per load/parse/rule phase.
+    """
+    trace_id = secrets.token_hex(16)
+    root_id = secrets.token_hex(8)
+
+    spans = [{
+        'traceId': trace_id,
+        'spanId': root_id,
+        'name': 'review',
+        'kind': 1,  # SPAN_KIND_INTERNAL
+        'startTimeUnixNano': str(min(s['start_ns'] for s in samples)),
+        'endTimeUnixNano': str(max(s['end_ns'] for s in samples)),
+        'attributes': [
+            _attr('review.findings', sum(s['findings'] for s in samples)),
+            _attr('review.scripts', len({s['script'] for s in samples})),
+        ],
+    }]
+
+    for s in samples:
+        name = f"{s['phase']} {s['rule'] or s['script']}"
+        spans.append({
+            'traceId': trace_id,
+            'spanId': secrets.token_hex(8),
+            'parentSpanId': root_id,
+            'name': name,
+            'kind': 1,
+            'startTimeUnixNano': str(s['start_ns']),
+            'endTimeUnixNano': str(s['end_ns']),
+            'attributes': [
+                _attr('review.phase', s['phase']),
+                _attr('review.script', s['script']),
+                _attr('review.rule', s['rule']),
+                _attr('review.findings', s['findings']),
+                _attr('review.allocated_bytes', s['allocated_bytes']),
+            ],
+        })
+
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [_attr('service.name', SERVICE_NAME)]},
+            'scopeSpans': [{
+                'scope': {'name': 'review_telemetry'},
+                'spans': spans,
+            }],
+        }],
+    }
+
+
+def export_otlp(endpoint, payload, timeout=5):
+    """POST the payload to an OTLP/HTTP receiver; returns the HTTP status."""
+    request = urllib.request.Request(
+        endpoint,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def print_timing_table(samples, stream):
+    print('=' * 80, file=stream)
+    print('REVIEW TIMING (slowest first)', file=stream)
+    print('=' * 80, file=stream)
+    print(f"{'PHASE':<7} {'SCRIPT':<26} {'RULE':<40} {'MS':>8} {'KB':>8} {'FIND':>5}", file=stream)
+    for s in sorted(samples, key=lambda s: s['duration_ns'], reverse=True):
+        print(f"{s['phase']:<7} {s['script']:<26} {s['rule'][:40]:<40} "
+              f"{s['duration_ns'] / 1e6:>8.3f} {s['allocated_bytes'] / 1024:>8.1f} "
+              f"{s['findings']:>5}", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--textfile', help='Write Prometheus exposition to this file')
+    parser.add_argument('--listen', type=int, metavar='PORT',
+                        help='Serve Prometheus exposition on this port at /metrics')
+    parser.add_argument('--otlp', action='store_true',
+                        help=f'Send OTLP spans to the collector defined in {OTEL_CONFIG}')
+    parser.add_argument('--otlp-endpoint', metavar='URL',
+                        help='Send OTLP spans to this OTLP/HTTP traces URL (implies --otlp)')
+    parser.add_argument('--no-allocations', action='store_true',
+                        help='Skip the tracemalloc pass; allocated bytes are reported as 0')
+    parser.add_argument('--quiet', action='store_true', help='Do not print the review report')
+    args = parser.parse_args(argv)
+
+    run_timestamp = time.time()
+    samples, report = run_review(track_allocations=not args.no_allocations)
+
+    if not args.quiet:
+        sys.stdout.write(report)
+    print_timing_table(samples, sys.stderr)
+
+    exposition = prometheus_exposition(samples, run_timestamp)
+    if args.textfile:
+        write_textfile(args.textfile, exposition)
+        print(f'Wrote Prometheus metrics to {args.textfile}', file=sys.stderr)
+
+    if args.otlp or args.otlp_endpoint:
+        endpoint = args.otlp_endpoint or collector_otlp_http_endpoint(os.path.join(HERE, OTEL_CONFIG))
+        try:
+            status = export_otlp(endpoint, otlp_trace_payload(samples))
+            print(f'Exported {len(samples) + 1} spans to {endpoint} (HTTP {status})', file=sys.stderr)
+        except OSError as e:
+            print(f'OTLP export to {endpoint} failed: {e}', file=sys.stderr)
+            return 1
+
+    if args.listen:
+        serve_metrics(args.listen, exposition)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
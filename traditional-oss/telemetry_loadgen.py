@@ -0,0 +1,762 @@
+#!/usr/bin/env python3
+"""
+Synthetic telemetry load generator for the Traditional OSS ingest paths.
+
+Drives Prometheus remote-write, Loki push and OTLP/HTTP traffic at the volumes
+assumed in ARCHITECTURE.md and aws-observability-cost-estimate.md, against the
+endpoints and batch sizes defined in the configs-*.yml files. Reports achieved
+throughput and latency percentiles per ingest path.
+
+Payloads are encoded once up front and replayed from a ring of buffers. Their
+timestamps are fixed-width fields that are patched in place before each send,
+so real receivers see fresh samples, log entries and spans rather than
+duplicates. Each path keeps a pool of HTTP/1.1 keep-alive connections driven
+by asyncio. Only the standard library is used (remote-write protobuf and
+snappy framing are encoded by hand).
+
+Usage:
+  python3 telemetry_loadgen.py --stand-in                 # built-in local receivers
+  python3 telemetry_loadgen.py --stand-in --profile cost-estimate --scale 10
+  python3 telemetry_loadgen.py --target-host 127.0.0.1 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import struct
+import sys
+import time
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROMETHEUS_CONFIG = 'configs-prometheus.yml'
+LOKI_CONFIG = 'configs-loki.yml'
+OTEL_CONFIG = 'configs-tempo-grafana-otel.yml'
+
+# =============================================================================
+# VOLUME PROFILES
+# =============================================================================
+
+PROFILES = {
+    # ARCHITECTURE.md sections 3.1-3.3
+    'architecture': {
+        'series': 20000,              # ~20,000 active time series
+        'scrape_interval_s': 30,      # Scrape Interval: 30 seconds
+        'log_bytes_per_day': 50e9,    # 50 hosts x 1GB/day/host
+        'log_line_bytes': 200,        # not stated; cost estimate's line size
+        'spans_per_sec': 150000 / 60, # 150 services x 1000 requests/min
+        'span_bytes': 2048,           # Span size: ~2KB average
+    },
+    # aws-observability-cost-estimate.md "Data Volume Assumptions"
+    'cost-estimate': {
+        'series': 5000,               # 50 hosts x 100 time series/host
+        'scrape_interval_s': 15,
+        'log_bytes_per_day': 50000 * 60 * 24 * 200,  # 50,000 lines/min x 200 bytes
+        'log_line_bytes': 200,
+        'spans_per_sec': 5000 * 5 / 60,              # 5,000 traces/min x 5 spans
+        'span_bytes': 2048,
+    },
+}
+
+# Distinct pre-encoded Loki and OTLP payloads, replayed round-robin. Remote-write
+# gets as many buffers as it takes to cover every series of the profile.
+PAYLOAD_VARIANTS = 4
+
+# Remote-write timestamps are padded varints of this many bytes (7 x 7 bits
+# holds millisecond timestamps well past year 10000); JSON timestamps are
+# 19-digit nanosecond strings.
+TS_VARINT_WIDTH = 7
+TS_DIGITS = 19
+
+# Prometheus' own max_samples_per_send default, used when configs-prometheus.yml
+# only documents remote_write in a commented-out example
+DEFAULT_REMOTE_WRITE_BATCH = 2000
+
+
+# =============================================================================
+# CONFIG DISCOVERY
+# =============================================================================
+
+def _read(name):
+    with open(os.path.join(HERE, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def _search(pattern, text, source):
+    match = re.search(pattern, text, re.MULTILINE)
+    if not match:
+        raise ValueError(f'Pattern {pattern!r} not found in {source}')
+    return match.group(1)
+
+
+def _search_uncommented(key, text):
+    match = re.search(rf'^[ \t]*{key}:\s*(\d+)', text, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def _collector_otlp_http_url(otel):
+    """
+    OTLP/HTTP traces URL of the OTel Collector (agent mode) receiver. The
+    receiver binds 0.0.0.0, which clients on the host reach via localhost.
+    """
+    start = otel.find('OPENTELEMETRY COLLECTOR CONFIGURATION')
+    if start == -1:
+        raise ValueError(f'No OpenTelemetry Collector section in {OTEL_CONFIG}')
+    endpoint = _search(r'^\s+http:\s*\n\s+endpoint:\s*(\S+:\d+)', otel[start:], OTEL_CONFIG)
+    host, _, port = endpoint.rpartition(':')
+    if host in ('0.0.0.0', '::', ''):
+        host = 'localhost'
+    return f'http://{host}:{port}/v1/traces'
+
+
+def load_ingest_config():
+    """
+    Read endpoints, batch sizes and limits from the configs-*.yml files.
+
+    These files concatenate several configs (and commented examples), so values
+    are located by pattern rather than by loading YAML.
+    """
+    otel = _read(OTEL_CONFIG)
+    loki = _read(LOKI_CONFIG)
+    prometheus = _read(PROMETHEUS_CONFIG)
+
+    # remote_write is only present as a commented example in configs-prometheus.yml
+    rw_batch = _search_uncommented('max_samples_per_send', prometheus)
+    if rw_batch is None:
+        rw_batch, rw_source = DEFAULT_REMOTE_WRITE_BATCH, 'Prometheus default max_samples_per_send'
+    else:
+        rw_source = f'{PROMETHEUS_CONFIG} max_samples_per_send'
+
+    return {
+        'remote_write': {
+            # OTel Collector prometheusremotewrite exporter
+            'url': _search(r'prometheusremotewrite:\s*\n\s+endpoint:\s*(\S+)', otel, OTEL_CONFIG),
+            'batch': rw_batch,
+            'batch_source': rw_source,
+        },
+        'loki_push': {
+            # Promtail client
+            'url': _search(r'-\s*url:\s*(\S+/loki/api/v1/push)', loki, LOKI_CONFIG),
+            'batch': int(_search(r'batchsize:\s*(\d+)', loki, LOKI_CONFIG)),
+            'batch_source': f'{LOKI_CONFIG} batchsize (bytes)',
+            'limit_bytes_per_sec': int(_search(r'ingestion_rate_mb:\s*(\d+)', loki, LOKI_CONFIG)) * 1024 * 1024,
+        },
+        'otlp': {
+            # OTel Collector OTLP http receiver
+            'url': _collector_otlp_http_url(otel),
+            'batch': int(_search(r'send_batch_size:\s*(\d+)', otel, OTEL_CONFIG)),
+            'batch_source': f'{OTEL_CONFIG} send_batch_size',
+        },
+    }
+
+
+# =============================================================================
+# PAYLOAD ENCODING
+# =============================================================================
+
+def _varint(n):
+    out = bytearray()
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _pb_bytes(field, data):
+    return _varint(field << 3 | 2) + _varint(len(data)) + data
+
+
+def _varint_fixed(n, width):
+    """Varint padded to exactly `width` bytes, so it can be patched in place."""
+    if n >= 1 << (7 * width):
+        raise ValueError(f'{n} does not fit in a {width}-byte varint')
+    return bytes(
+        (n >> (7 * k)) & 0x7f | (0x80 if k < width - 1 else 0)
+        for k in range(width)
+    )
+
+
+def _varint_ms(ns):
+    return _varint_fixed(ns // 1000000, TS_VARINT_WIDTH)
+
+
+def _digits_ns(ns):
+    return b'%019d' % ns
+
+
+def _snappy_literal(pieces):
+    """
+    Snappy block format using literal elements only (valid, uncompressed).
+
+    Pieces are never split across literal elements, so a byte range inside a
+    piece stays contiguous in the output. Returns (data, piece_offsets).
+    """
+    out = bytearray(_varint(sum(len(piece) for piece in pieces)))
+    offsets = []
+    i = 0
+    while i < len(pieces):
+        chunk = [pieces[i]]
+        size = len(pieces[i])
+        i += 1
+        while i < len(pieces) and size + len(pieces[i]) <= 65536:
+            chunk.append(pieces[i])
+            size += len(pieces[i])
+            i += 1
+        n = size - 1
+        if n < 60:
+            out.append(n << 2)
+        elif n < 256:
+            out.append(60 << 2)
+            out.append(n)
+        else:
+            out.append(61 << 2)
+            out += struct.pack('<H', n)
+        for piece in chunk:
+            offsets.append(len(out))
+            out += piece
+    return bytes(out), offsets
+
+
+def encode_remote_write(series_ids):
+    """
+    Encode a snappy-framed prometheus.WriteRequest with one sample per series.
+
+    Returns (body, stamps): stamps lists the offset of each sample timestamp
+    with its delta from the send time (always 0).
+    """
+    pieces = []
+    for i in series_ids:
+        labels = [
+            ('__name__', f'loadgen_metric_{i % 200}'),
+            ('instance', f'host-{i // 200 % 50}:9100'),
+            ('job', 'loadgen'),
+            ('series', str(i)),
+        ]
+        ts = b''.join(
+            _pb_bytes(1, _pb_bytes(1, name.encode()) + _pb_bytes(2, value.encode()))
+            for name, value in labels
+        )
+        sample = b'\x09' + struct.pack('<d', float(i)) + b'\x10' + bytes(TS_VARINT_WIDTH)
+        ts += _pb_bytes(2, sample)
+        pieces.append(_pb_bytes(1, ts))
+
+    body, offsets = _snappy_literal(pieces)
+    stamps = [
+        (offset + len(piece) - TS_VARINT_WIDTH, 0)
+        for offset, piece in zip(offsets, pieces)
+    ]
+    return body, stamps
+
+
+def encode_loki_push(batch_bytes, line_bytes, variant):
+    """
+    Encode a Loki JSON push request carrying about batch_bytes of log lines.
+
+    Returns (body, lines, stamps): entries are stamped send time + 1ns, + 2ns,
+    ... in document order, which keeps every stream in increasing order.
+    """
+    lines = max(batch_bytes // line_bytes, 1)
+    placeholder = '0' * TS_DIGITS
+    streams = {}
+    for i in range(lines):
+        host = f'host-{i % 50}'
+        prefix = f'level=info host={host} variant={variant} seq={i} msg='
+        line = prefix + 'x' * max(line_bytes - len(prefix), 0)
+        streams.setdefault(host, []).append([placeholder, line])
+    payload = {
+        'streams': [
+            {'stream': {'job': 'loadgen', 'host': host}, 'values': values}
+            for host, values in streams.items()
+        ],
+    }
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    stamps = [
+        (match.start(1), k)
+        for k, match in enumerate(re.finditer(rb'\["(0{%d})",' % TS_DIGITS, body))
+    ]
+    return body, lines, stamps
+
+
+def encode_otlp_traces(spans, span_bytes, variant):
+    """
+    Encode an OTLP/HTTP JSON ExportTraceServiceRequest of `spans` spans.
+
+    Returns (body, stamps): each span starts at send time and lasts 1ms.
+    """
+    padding = 'x' * max(span_bytes - 300, 0)
+    placeholder = '0' * TS_DIGITS
+    out = []
+    for i in range(spans):
+        trace_id = f'{variant:08x}{i // 5:024x}'
+        out.append({
+            'traceId': trace_id,
+            'spanId': f'{variant:04x}{i:012x}',
+            'name': f'GET /loadgen/{i % 20}',
+            'kind': 2,  # SPAN_KIND_SERVER
+            'startTimeUnixNano': placeholder,
+            'endTimeUnixNano': placeholder,
+            'attributes': [
+                {'key': 'service.name', 'value': {'stringValue': f'service-{i % 150}'}},
+                {'key': 'loadgen.padding', 'value': {'stringValue': padding}},
+            ],
+        })
+    payload = {
+        'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'loadgen'}}]},
+            'scopeSpans': [{'scope': {'name': 'telemetry_loadgen'}, 'spans': out}],
+        }],
+    }
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    stamps = [
+        (match.start(2), 0 if match.group(1) == b'start' else 1000000)
+        for match in re.finditer(rb'"(start|end)TimeUnixNano":"(0{%d})"' % TS_DIGITS, body)
+    ]
+    return body, stamps
+
+
+def _http_request(url, body, content_type, extra_headers=()):
+    parts = urlsplit(url)
+    headers = [
+        f'POST {parts.path or "/"} HTTP/1.1',
+        f'Host: {parts.netloc}',
+        f'Content-Type: {content_type}',
+        f'Content-Length: {len(body)}',
+        'Connection: keep-alive',
+        *extra_headers,
+    ]
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body
+
+
+def prepare_request(url, body, stamps, ts_format, content_type, extra_headers=()):
+    """
+    Wrap an encoded body into a fully encoded HTTP request whose timestamp
+    fields can be refreshed with stamp_request().
+    """
+    request = _http_request(url, body, content_type, extra_headers)
+    header_len = len(request) - len(body)
+    return {
+        'buffer': bytearray(request),
+        'stamps': [(header_len + offset, delta) for offset, delta in stamps],
+        'format': ts_format,
+    }
+
+
+def stamp_request(request, now_ns):
+    """Overwrite the request's timestamp fields in place, relative to now_ns."""
+    buffer, ts_format = request['buffer'], request['format']
+    for offset, delta in request['stamps']:
+        value = ts_format(now_ns + delta)
+        buffer[offset:offset + len(value)] = value
+
+
+def build_paths(profile, config, scale):
+    """
+    Pre-encode request buffers and compute target request rates per path.
+
+    Each path dict carries: url, unit, units per request, where the batch size
+    came from, target requests/sec and a ring of prepared HTTP requests (see
+    prepare_request()).
+    """
+    paths = []
+
+    # Prometheus remote-write: samples/sec = series / scrape interval. One pass
+    # through the buffers sends one sample for every series of the profile.
+    rw = config['remote_write']
+    series = max(int(profile['series'] * scale), 1)
+    samples_per_sec = profile['series'] / profile['scrape_interval_s'] * scale
+    batch = max(min(rw['batch'], series), 1)
+    requests = []
+    for v in range(math.ceil(series / batch)):
+        body, stamps = encode_remote_write([(v * batch + j) % series for j in range(batch)])
+        requests.append(prepare_request(rw['url'], body, stamps, _varint_ms, 'application/x-protobuf', (
+            'Content-Encoding: snappy',
+            'X-Prometheus-Remote-Write-Version: 0.1.0',
+        )))
+    paths.append({
+        'name': 'prometheus_remote_write',
+        'url': rw['url'],
+        'unit': 'samples',
+        'series': series,
+        'units_per_request': batch,
+        'batch_source': rw['batch_source'],
+        'target_rps': samples_per_sec / batch,
+        'requests': requests,
+    })
+
+    # Loki push: bytes/sec from daily volume, batched to promtail batchsize
+    loki = config['loki_push']
+    log_bytes_per_sec = profile['log_bytes_per_day'] / 86400 * scale
+    requests = []
+    for v in range(PAYLOAD_VARIANTS):
+        body, lines, stamps = encode_loki_push(loki['batch'], profile['log_line_bytes'], v)
+        requests.append(prepare_request(loki['url'], body, stamps, _digits_ns, 'application/json'))
+    paths.append({
+        'name': 'loki_push',
+        'url': loki['url'],
+        'unit': 'lines',
+        'units_per_request': lines,
+        'batch_source': loki['batch_source'],
+        'target_rps': log_bytes_per_sec / (lines * profile['log_line_bytes']),
+        # ingestion_rate_mb limits log-line bytes, not HTTP/JSON framing
+        'log_bytes_per_request': lines * profile['log_line_bytes'],
+        'limit_bytes_per_sec': loki['limit_bytes_per_sec'],
+        'requests': requests,
+    })
+
+    # OTLP traces: spans/sec batched to the collector's send_batch_size
+    otlp = config['otlp']
+    spans_per_sec = profile['spans_per_sec'] * scale
+    batch = otlp['batch']
+    requests = []
+    for v in range(PAYLOAD_VARIANTS):
+        body, stamps = encode_otlp_traces(batch, profile['span_bytes'], v)
+        requests.append(prepare_request(otlp['url'], body, stamps, _digits_ns, 'application/json'))
+    paths.append({
+        'name': 'otlp_traces',
+        'url': otlp['url'],
+        'unit': 'spans',
+        'units_per_request': batch,
+        'batch_source': otlp['batch_source'],
+        'target_rps': spans_per_sec / batch,
+        'requests': requests,
+    })
+
+    return paths
+
+
+# =============================================================================
+# ASYNC HTTP CLIENT (keep-alive connection pool)
+# =============================================================================
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; returns the status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by receiver')
+    status = int(status_line.split()[1])
+
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            close = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+
+    return status, close
+
+
+class ConnectionPool:
+    """
+    Pool of at most `size` keep-alive connections to one host:port.
+
+    A semaphore bounds the connections in use; an idle connection is reused
+    when available, otherwise a new one is opened. Dropping a connection
+    releases its slot, so waiters are never stranded.
+    """
+
+    def __init__(self, host, port, size, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+
+    async def acquire(self):
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, reusable=True):
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        self._slots.release()
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+async def _exchange(conn, request):
+    reader, writer = conn
+    # Stamp and copy with no await in between: buffers are shared by
+    # concurrent sends, and the transport may hold on to what it is given.
+    stamp_request(request, time.time_ns())
+    writer.write(bytes(request['buffer']))
+    await writer.drain()
+    return await _read_response(reader)
+
+
+async def _send(pool, path, request, stats, scheduled):
+    """
+    Send one request. Latency runs from the scheduled send time, so waiting
+    for a free pooled connection counts against it; that wait is also kept
+    separately as queue time.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        conn = await pool.acquire()
+    except asyncio.TimeoutError:
+        stats['timeouts'] += 1
+        stats['errors'] += 1
+        return
+    except OSError:
+        stats['errors'] += 1
+        return
+
+    stats['queue_waits'].append(max(loop.time() - scheduled, 0))
+    try:
+        status, close = await asyncio.wait_for(_exchange(conn, request), pool.timeout)
+    except asyncio.TimeoutError:
+        pool.release(conn, reusable=False)
+        stats['timeouts'] += 1
+        stats['errors'] += 1
+        return
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+        pool.release(conn, reusable=False)
+        stats['errors'] += 1
+        return
+
+    stats['latencies'].append(loop.time() - scheduled)
+    pool.release(conn, reusable=not close)
+    if 200 <= status < 300:
+        stats['ok'] += 1
+        stats['bytes'] += len(request['buffer'])
+        stats['log_bytes'] += path.get('log_bytes_per_request', 0)
+    else:
+        stats['errors'] += 1
+
+
+async def drive_path(path, duration, connections, timeout):
+    """Send path['requests'] at path['target_rps'] for `duration` seconds."""
+    parts = urlsplit(path['url'])
+    pool = ConnectionPool(parts.hostname, parts.port or 80, connections, timeout)
+    stats = {
+        'sends': 0, 'ok': 0, 'errors': 0, 'timeouts': 0, 'late': 0,
+        'bytes': 0, 'log_bytes': 0, 'latencies': [], 'queue_waits': [],
+    }
+
+    tasks = set()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    interval = 1 / path['target_rps'] if path['target_rps'] > 0 else None
+    i = 0
+    while interval is not None:
+        scheduled = start + i * interval
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif delay < -interval:
+            stats['late'] += 1
+        request = path['requests'][i % len(path['requests'])]
+        task = asyncio.create_task(_send(pool, path, request, stats, scheduled))
+        stats['sends'] += 1
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        i += 1
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    # Sends go out at t=0, interval, 2*interval, ... so they cover
+    # sends * interval seconds of the target rate, not `duration`
+    stats['window'] = stats['sends'] * interval if stats['sends'] else duration
+    await pool.close()
+    return stats
+
+
+# =============================================================================
+# LOCAL STAND-IN RECEIVERS
+# =============================================================================
+
+async def _stand_in_handler(reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value.strip())
+            await reader.readexactly(length)
+
+            if b'/v1/traces' in request_line:
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: 2\r\n\r\n{}')
+            else:
+                writer.write(b'HTTP/1.1 204 No Content\r\n\r\n')
+            await writer.drain()
+    except (OSError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_stand_ins(ports):
+    """Listen on 127.0.0.1 at each port, accepting any push and replying 2xx."""
+    return [await asyncio.start_server(_stand_in_handler, '127.0.0.1', port) for port in sorted(ports)]
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    index = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def print_report(profile_name, scale, duration, paths, results):
+    print('=' * 80)
+    print(f'TELEMETRY LOAD TEST: profile={profile_name} scale={scale}x duration={duration}s')
+    print('=' * 80)
+    print()
+
+    for path, stats in zip(paths, results):
+        latencies = sorted(stats['latencies'])
+        window = max(stats['window'], 1e-9)
+        unit = path['unit']
+        target_units = path['target_rps'] * path['units_per_request']
+        achieved_units = stats['ok'] * path['units_per_request'] / window
+        bytes_per_sec = stats['bytes'] / window
+        completed = stats['ok'] / stats['sends'] * 100 if stats['sends'] else 0.0
+
+        queue_waits = sorted(stats['queue_waits'])
+
+        print(f"[{path['name']}] {path['url']}")
+        print(f"   Batch:      {path['units_per_request']} {unit}/request ({path['batch_source']})")
+        if 'series' in path:
+            print(f"   Series:     {path['series']:,} across {len(path['requests'])} buffers")
+        print(f"   Target:     {target_units:,.1f} {unit}/s ({path['target_rps']:.2f} req/s)")
+        print(f"   Achieved:   {achieved_units:,.1f} {unit}/s ({stats['ok'] / window:.2f} req/s, "
+              f"{bytes_per_sec / 1024:,.1f} KiB/s over a {window:.1f}s send window)")
+        print(f"   Completed:  {stats['ok']}/{stats['sends']} scheduled requests ({completed:.1f}%)")
+        print(f"   Latency:    p50={_percentile(latencies, 0.50) * 1000:.2f}ms "
+              f"p95={_percentile(latencies, 0.95) * 1000:.2f}ms "
+              f"p99={_percentile(latencies, 0.99) * 1000:.2f}ms "
+              f"max={(latencies[-1] if latencies else float('nan')) * 1000:.2f}ms "
+              f"(from scheduled send time)")
+        print(f"   Pool wait:  p50={_percentile(queue_waits, 0.50) * 1000:.2f}ms "
+              f"p99={_percentile(queue_waits, 0.99) * 1000:.2f}ms (includes connect)")
+        print(f"   Errors:     {stats['errors']} ({stats['timeouts']} timeouts)  Late sends: {stats['late']}")
+        if 'limit_bytes_per_sec' in path:
+            log_bytes_per_sec = stats['log_bytes'] / window
+            share = log_bytes_per_sec / path['limit_bytes_per_sec'] * 100
+            print(f"   Limit:      ingestion_rate_mb {path['limit_bytes_per_sec'] / 1024 / 1024:.0f}MB/s, "
+                  f"log lines {log_bytes_per_sec / 1024:,.1f} KiB/s ({share:.2f}% used)")
+        print()
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def _retarget(url, host, port_offset):
+    parts = urlsplit(url)
+    host = host or parts.hostname
+    port = (parts.port or 80) + port_offset
+    return parts._replace(netloc=f'{host}:{port}').geturl()
+
+
+async def run(args):
+    config = load_ingest_config()
+    for path_config in config.values():
+        path_config['url'] = _retarget(path_config['url'], args.target_host, args.port_offset)
+
+    paths = build_paths(PROFILES[args.profile], config, args.scale)
+
+    servers = []
+    if args.stand_in:
+        servers = await start_stand_ins({urlsplit(p['url']).port for p in paths})
+
+    try:
+        results = await asyncio.gather(*(
+            drive_path(path, args.duration, args.connections, args.timeout) for path in paths
+        ))
+    finally:
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+
+    print_report(args.profile, args.scale, args.duration, paths, results)
+    return 1 if any(stats['errors'] for stats in results) else 0
+
+
+def _positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'must be greater than 0, got {value}')
+    return number
+
+
+def _positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'must be greater than 0, got {value}')
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='architecture',
+                        help='Volume assumptions to generate (default: architecture)')
+    parser.add_argument('--scale', type=_positive_float, default=1.0,
+                        help='Multiply profile volumes, e.g. 10 for 500 hosts (default: 1)')
+    parser.add_argument('--duration', type=_positive_float, default=30.0, help='Seconds to run (default: 30)')
+    parser.add_argument('--connections', type=_positive_int, default=8,
+                        help='Keep-alive connections per ingest path (default: 8)')
+    parser.add_argument('--timeout', type=_positive_float, default=10.0,
+                        help='Seconds allowed for each connect and each request/response; '
+                             'a timeout counts as an error (default: 10)')
+    parser.add_argument('--target-host', metavar='HOST',
+                        help='Send to HOST instead of the hosts in the configs (ports and paths kept)')
+    parser.add_argument('--port-offset', type=int, default=0,
+                        help='Add to every configured port, to avoid clashing with local services')
+    parser.add_argument('--stand-in', action='store_true',
+                        help='Start local stand-in receivers and target 127.0.0.1')
+    args = parser.parse_args(argv)
+
+    if args.stand_in:
+        args.target_host = '127.0.0.1'
+
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import review_telemetry
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class _OTLPStandIn(BaseHTTPRequestHandler):
+    """Stand-in OTLP/HTTP receiver that records each posted payload."""
+
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append((self.path, json.loads(body)))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SplitSectionsTest(unittest.TestCase):
+
+    def test_sections_follow_banners(self):
+        with open(os.path.join(HERE, 'review_analysis.py'), encoding='utf-8') as f:
+            source = f.read()
+        sections = review_telemetry._split_sections(source)
+        self.assertEqual([rule for rule, _, _ in sections],
+                         ['preamble', 'terraform_review', 'prometheus_configuration_review'])
+        # Line numbers map back onto the original file
+        _, first_line, text = sections[1]
+        self.assertEqual(source.splitlines()[first_line - 1], text.splitlines()[0])
+
+    def test_comment_only_preamble_is_skipped(self):
+        source = '#!/usr/bin/env python3\n\n# =====\n# LOKI REVIEW\n# =====\nx_issues = [1]\n'
+        self.assertEqual([rule for rule, _, _ in review_telemetry._split_sections(source)],
+                         ['loki_review'])
+
+
+class RunReviewTest(unittest.TestCase):
+
+    def test_findings_per_rule(self):
+        samples, output = review_telemetry.run_review(track_allocations=False)
+        findings = {s['rule']: s['findings'] for s in samples if s['phase'] == 'rule'}
+        self.assertEqual(findings, {
+            'preamble': 0,
+            'terraform_review': 16,
+            'prometheus_configuration_review': 9,
+            'loki_configuration_review': 11,
+            'tempo_opentelemetry_configuration_review': 13,
+            'architecture_vs_config_consistency_review': 8,
+            'security_review': 8,
+            'summary': 0,
+        })
+        self.assertIn('REVIEW SUMMARY', output)
+
+
+class PrometheusExpositionTest(unittest.TestCase):
+
+    def _sample(self, rule):
+        return {'phase': 'rule', 'script': 'review.py', 'rule': rule, 'findings': 3,
+                'allocated_bytes': 128, 'duration_ns': 2000000, 'start_ns': 0, 'end_ns': 2000000}
+
+    def test_one_help_and_type_per_metric(self):
+        text = review_telemetry.prometheus_exposition([self._sample('a'), self._sample('b')], 1.0)
+        helps = [line.split()[2] for line in text.splitlines() if line.startswith('# HELP')]
+        types = [line.split()[2] for line in text.splitlines() if line.startswith('# TYPE')]
+        self.assertEqual(helps, types)
+        self.assertEqual(len(helps), len(set(helps)))
+        self.assertIn('review_rule_findings{script="review.py",rule="a"} 3', text)
+        self.assertIn('review_phase_duration_seconds{script="review.py",phase="rule",rule="b"} 0.002', text)
+
+    def test_label_values_are_escaped(self):
+        text = review_telemetry.prometheus_exposition([self._sample('say "hi"\\\n')], 1.0)
+        self.assertIn(r'rule="say \"hi\"\\\n"', text)
+
+
+class OTLPExportTest(unittest.TestCase):
+
+    def test_collector_endpoint_from_config(self):
+        endpoint = review_telemetry.collector_otlp_http_endpoint(
+            os.path.join(HERE, review_telemetry.OTEL_CONFIG))
+        self.assertEqual(endpoint, 'http://localhost:4318/v1/traces')
+
+    def test_main_exports_spans_to_stand_in(self):
+        _OTLPStandIn.received = []
+        server = HTTPServer(('127.0.0.1', 0), _OTLPStandIn)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        endpoint = f'http://127.0.0.1:{server.server_port}/v1/traces'
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                status = review_telemetry.main(['--quiet', '--no-allocations', '--otlp-endpoint', endpoint])
+            thread.join(5)
+        finally:
+            server.server_close()
+
+        self.assertEqual(status, 0)
+        self.assertEqual(len(_OTLPStandIn.received), 1)
+        path, payload = _OTLPStandIn.received[0]
+        self.assertEqual(path, '/v1/traces')
+        spans = payload['resourceSpans'][0]['scopeSpans'][0]['spans']
+        samples, _ = review_telemetry.run_review(track_allocations=False)
+        self.assertEqual(len(spans), len(samples) + 1)
+        root = [s for s in spans if 'parentSpanId' not in s]
+        self.assertEqual([s['name'] for s in root], ['review'])
+        for span in spans:
+            if span is not root[0]:
+                self.assertEqual(span['parentSpanId'], root[0]['spanId'])
+                self.assertEqual(span['traceId'], root[0]['traceId'])
+
+
+if __name__ == '__main__':
+    unittest.main()
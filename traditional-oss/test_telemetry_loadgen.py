@@ -0,0 +1,209 @@
+import asyncio
+import contextlib
+import io
+import json
+import re
+import struct
+import time
+import unittest
+
+import telemetry_loadgen
+
+
+async def _close_after_reply(reader, writer):
+    """Receiver that answers every request with Connection: close."""
+    await reader.readuntil(b'\r\n\r\n')
+    writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+    await writer.drain()
+    writer.close()
+
+
+async def _never_reply(reader, writer):
+    """Receiver that accepts the connection but never responds."""
+    await asyncio.sleep(3600)
+
+
+def _path(port, rps):
+    url = f'http://127.0.0.1:{port}/api/v1/write'
+    return {
+        'name': 'test',
+        'url': url,
+        'unit': 'samples',
+        'units_per_request': 1,
+        'batch_source': 'test',
+        'target_rps': rps,
+        'requests': [telemetry_loadgen.prepare_request(url, b'x', [], None, 'application/x-protobuf')],
+    }
+
+
+async def _drive_against(handler, rps, duration, connections, timeout):
+    server = await asyncio.start_server(handler, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.wait_for(
+            telemetry_loadgen.drive_path(_path(port, rps), duration, connections, timeout), 10)
+    finally:
+        server.close()
+
+
+class DrivePathTest(unittest.TestCase):
+
+    def test_connection_close_does_not_strand_pool_waiters(self):
+        stats = asyncio.run(_drive_against(_close_after_reply, rps=50, duration=1,
+                                           connections=2, timeout=5))
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(stats['ok'], 50)
+
+    def test_stalled_receiver_times_out(self):
+        stats = asyncio.run(_drive_against(_never_reply, rps=10, duration=0.5,
+                                           connections=2, timeout=0.2))
+        self.assertEqual(stats['ok'], 0)
+        self.assertEqual(stats['timeouts'], 5)
+        self.assertEqual(stats['errors'], 5)
+
+    def test_latency_includes_pool_wait(self):
+        # One connection and back-to-back sends: later requests queue for it
+        stats = asyncio.run(_drive_against(_close_after_reply, rps=200, duration=0.25,
+                                           connections=1, timeout=5))
+        self.assertEqual(len(stats['latencies']), len(stats['queue_waits']))
+        for latency, wait in zip(stats['latencies'], stats['queue_waits']):
+            self.assertGreaterEqual(latency, wait)
+
+
+def _varint_at(data, pos):
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+
+def _snappy_literal_decode(data):
+    length, pos = _varint_at(data, 0)
+    out = bytearray()
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        n = tag >> 2
+        if n >= 60:
+            width = n - 59
+            n = int.from_bytes(data[pos:pos + width], 'little')
+            pos += width
+        out += data[pos:pos + n + 1]
+        pos += n + 1
+    assert len(out) == length
+    return bytes(out)
+
+
+def _pb_fields(data):
+    """Yield (field, value) for a protobuf message (varint, fixed64, bytes)."""
+    pos = 0
+    while pos < len(data):
+        key, pos = _varint_at(data, pos)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint_at(data, pos)
+        elif wire == 1:
+            value, pos = struct.unpack('<d', data[pos:pos + 8])[0], pos + 8
+        else:
+            n, pos = _varint_at(data, pos)
+            value, pos = data[pos:pos + n], pos + n
+        yield field, value
+
+
+def _remote_write_series(request):
+    """Return [(series label, timestamp_ms)] from a prepared remote-write request."""
+    raw = bytes(request['buffer'])
+    body = _snappy_literal_decode(raw[raw.index(b'\r\n\r\n') + 4:])
+    out = []
+    for _, ts in _pb_fields(body):
+        series, timestamp = None, None
+        for field, value in _pb_fields(ts):
+            if field == 1:
+                label = dict(_pb_fields(value))
+                if label[1] == b'series':
+                    series = int(label[2])
+            else:
+                timestamp = dict(_pb_fields(value))[2]
+        out.append((series, timestamp))
+    return out
+
+
+class BuildPathsTest(unittest.TestCase):
+
+    def test_tiny_scale_keeps_batch_positive(self):
+        config = telemetry_loadgen.load_ingest_config()
+        paths = telemetry_loadgen.build_paths(telemetry_loadgen.PROFILES['architecture'], config, 0.00001)
+        for path in paths:
+            self.assertGreaterEqual(path['units_per_request'], 1)
+            self.assertGreater(path['target_rps'], 0)
+
+    def test_commented_remote_write_batch_is_not_used(self):
+        config = telemetry_loadgen.load_ingest_config()
+        self.assertEqual(config['remote_write']['batch'], telemetry_loadgen.DEFAULT_REMOTE_WRITE_BATCH)
+        self.assertIn('default', config['remote_write']['batch_source'])
+
+
+    def test_remote_write_covers_exactly_the_profile_series(self):
+        config = telemetry_loadgen.load_ingest_config()
+        for name, profile in telemetry_loadgen.PROFILES.items():
+            for scale in (1, 0.37):
+                paths = telemetry_loadgen.build_paths(profile, config, scale)
+                rw = paths[0]
+                ids = [series for request in rw['requests'] for series, _ in _remote_write_series(request)]
+                self.assertEqual(set(ids), set(range(int(profile['series'] * scale))), (name, scale))
+
+    def test_timestamps_are_patched_per_send(self):
+        config = telemetry_loadgen.load_ingest_config()
+        paths = telemetry_loadgen.build_paths(telemetry_loadgen.PROFILES['cost-estimate'], config, 1)
+        rw, loki, otlp = paths
+        now_ns = time.time_ns()
+
+        telemetry_loadgen.stamp_request(rw['requests'][0], now_ns)
+        stamps = {ts for _, ts in _remote_write_series(rw['requests'][0])}
+        self.assertEqual(stamps, {now_ns // 1000000})
+
+        for path in (loki, otlp):
+            request = path['requests'][0]
+            telemetry_loadgen.stamp_request(request, now_ns)
+            raw = bytes(request['buffer'])
+            header, body = raw.split(b'\r\n\r\n', 1)
+            self.assertIn(b'Content-Length: %d' % len(body), header)
+            payload = json.loads(body)
+            self.assertNotIn(b'"0000000000000000000"', body)
+            if path is loki:
+                for stream in payload['streams']:
+                    times = [int(ts) for ts, _ in stream['values']]
+                    self.assertEqual(times, sorted(times))
+                    self.assertGreaterEqual(times[0], now_ns)
+            else:
+                span = payload['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+                self.assertEqual(int(span['startTimeUnixNano']), now_ns)
+                self.assertEqual(int(span['endTimeUnixNano']), now_ns + 1000000)
+
+        later = now_ns + 5 * 10**9
+        telemetry_loadgen.stamp_request(rw['requests'][0], later)
+        self.assertEqual({ts for _, ts in _remote_write_series(rw['requests'][0])}, {later // 1000000})
+
+    def test_connections_must_be_positive(self):
+        for value in ('0', '-1'):
+            with self.assertRaises(SystemExit):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    telemetry_loadgen.main(['--connections', value])
+
+
+class ReportWindowTest(unittest.TestCase):
+
+    def test_achieved_rate_uses_send_window(self):
+        # 3.5 req/s for 1s schedules sends at 0, 0.29, 0.57, 0.86 -> 4 sends
+        stats = asyncio.run(_drive_against(_close_after_reply, rps=3.5, duration=1,
+                                           connections=2, timeout=5))
+        self.assertEqual(stats['sends'], 4)
+        self.assertAlmostEqual(stats['ok'] / stats['window'], 3.5)
+
+
+if __name__ == '__main__':
+    unittest.main()